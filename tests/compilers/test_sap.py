@@ -2,7 +2,7 @@ from typing import List, Union
 
 import pytest
 
-from wes.compilers.sap import CompileSap
+from wes.compilers.sap import CompileSap, SapUnary
 from wes.exceptions import Message
 
 from ..utils import Eq, Predicate
@@ -10,7 +10,11 @@ from ..utils import Eq, Predicate
 
 @pytest.mark.parametrize(
     "file_txt,expected",
-    (("ldi 0x10", Eq("evaluated result '16' is too large")),),
+    (
+        ("ldi 0x10", Eq("evaluated result '16' is too large")),
+        ("sta 0 - 100", Eq("evaluated result '-100' is negative")),
+        ("lda x\nx = 0 - 100", Eq("evaluated result '-100' is negative")),
+    ),
 )
 def test_sap_instructions(file_txt: str, expected: Union[List[int], Predicate]) -> None:
     compiler = CompileSap.from_str(file_txt)
@@ -115,6 +119,29 @@ def test_compile_big_op_arg() -> None:
     assert "is too large" in excinfo.value.msg
 
 
+def test_literal_op_arg_encoded_on_scan() -> None:
+    compiler = CompileSap.from_str("lda 16")
+    with pytest.raises(Message) as excinfo:
+        compiler.scan()
+
+    assert "is too large" in excinfo.value.msg
+
+    compiler = CompileSap.from_str("lda 1\nlda foo\nfoo: 2")
+    assert list(compiler) == [0b00010001, 0b00010010, 0b00000010]
+
+
+def test_sap_unary_subclass_code() -> None:
+    class Ldb(SapUnary):
+        mnemonic = "ldb"
+        code = 0b1001
+
+    class CompileSapLdb(CompileSap):
+        instructions = {**CompileSap.instructions, Ldb.mnemonic: Ldb}
+
+    compiler = CompileSapLdb.from_str("ldb 3\nldb foo\nfoo: 2")
+    assert list(compiler) == [0b10010011, 0b10010010, 0b00000010]
+
+
 def test_compile_big_bare_literal() -> None:
     compiler = CompileSap.from_str("256")
     with pytest.raises(Message) as excinfo:
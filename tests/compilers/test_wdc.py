@@ -3,8 +3,9 @@ from typing import List, Tuple, Union
 import pytest
 
 from wes.compilers.wdc import Compile6502, Format
-from wes.exceptions import Message
+from wes.exceptions import Message, PatternError
 from wes.parser import BinExpr, Expr, Name, Parser, Val
+from wes.pattern import T, unify
 
 from ..utils import Eq, Predicate
 
@@ -32,6 +33,38 @@ def test_format_match(expr_str: str, expected: Tuple[Format, Expr]) -> None:
     assert (fmt, arg) == expected
 
 
+@pytest.mark.parametrize(
+    "expr_str",
+    (
+        "[[a + y]]",
+        "[[a] + x]",
+        "[[a + x] + y]",
+        "[[[a]] + y]",
+        "[a + b]",
+        "[a - x]",
+        "[(a + x)]",
+        "[x]",
+        "a + x",
+        "[[a]]",
+    ),
+)
+def test_format_match_unifies(expr_str: str) -> None:
+    expr = Parser.from_str(expr_str).parse_expr()
+    assert expr is not None
+
+    # the first format whose pattern unifies with the expression
+    for fmt in Format:
+        try:
+            subs = unify(expr, fmt.value)
+        except PatternError:
+            continue
+
+        assert Format.match(expr) == (fmt, subs[T])
+        break
+    else:
+        pytest.fail(f"no format unifies with '{expr_str}'")
+
+
 @pytest.mark.parametrize(
     "file_txt,expected",
     (
@@ -61,6 +94,7 @@ def test_format_match(expr_str: str, expected: Tuple[Format, Expr]) -> None:
         ("bbr0", Eq("instruction 'bbr0' expects an argument")),
         ("bbr0 foo, bar", Eq("instruction 'bbr0' expects one argument")),
         ("bbr0 256", Eq("evaluated result '256' does not fit in one byte")),
+        ("beq 0 - 129", Eq("evaluated result '-129' does not fit in one byte")),
         # ADC
         ("adc [0x100]", [0x6D, 0x00, 0x01]),
         ("adc [0x100 + x]", [0x7D, 0x00, 0x01]),
@@ -109,6 +143,8 @@ def test_format_match(expr_str: str, expected: Tuple[Format, Expr]) -> None:
         ("bcc 0xff", [0x90, 0xFF]),
         ("bcs 0xff", [0xB0, 0xFF]),
         ("beq 0xff", [0xF0, 0xFF]),
+        ("beq 0 - 1", [0xF0, 0xFF]),
+        ("beq 0 - 128", [0xF0, 0x80]),
         # LDA
         ("lda [0x100]", [0xAD, 0x00, 0x01]),
         ("lda [0x100 + x]", [0xBD, 0x00, 0x01]),
@@ -137,3 +173,12 @@ def test_wdc_instructions(file_txt: str, expected: Union[List[int], Predicate])
         assert expected(excinfo.value.msg)
     else:
         assert list(compiler) == expected
+
+
+def test_wdc_encode_repeatable() -> None:
+    compiler = Compile6502.from_str("lda [0x100]\nbeq 0x10\nnop")
+    compiler.scan()
+
+    for inst, _ in compiler.code:
+        assert list(inst.encode()) == list(inst.encode())
+        assert len(list(inst.encode())) == inst.size
@@ -3,14 +3,14 @@ from io import BytesIO, StringIO
 import pytest
 
 from wes.cli import Binary, BinaryText, run
+from wes.compiler import Compiler
 from wes.compilers.sap import CompileSap
 from wes.exceptions import Message
 
 
-@pytest.fixture
-def in_buf() -> StringIO:
-    return StringIO(
-        """
+@pytest.fixture(scope="module")
+def file_txt() -> str:
+    return """
 ; Counts from 42 to 256 (zero really in 8 bits), then down from 255 to 1
 ; before halting
 
@@ -33,14 +33,19 @@ end: hlt
 init: 42
 incr: 1
 """
-    )
 
 
-def test_run_binary_text(in_buf: StringIO) -> None:
+@pytest.fixture(scope="module")
+def compiler(file_txt: str) -> Compiler:
+    # compiled once and shared by the formatter tests
+    return CompileSap.from_str(file_txt)
+
+
+def test_run_binary_text(file_txt: str) -> None:
     out_buf = StringIO()
     formatter = BinaryText(out_buf)
 
-    run(in_buf, formatter, CompileSap)
+    run(file_txt, formatter, CompileSap)
     out_buf.seek(0)
 
     # fmt: off
@@ -61,11 +66,24 @@ def test_run_binary_text(in_buf: StringIO) -> None:
     # fmt: on
 
 
-def test_run_binary(in_buf: StringIO) -> None:
+def test_binary_text_chunked(compiler: Compiler) -> None:
+    expected_buf = StringIO()
+    BinaryText(expected_buf).format(compiler)
+
+    out_buf = StringIO()
+    formatter = BinaryText(out_buf)
+    formatter.chunk_size = 5
+
+    formatter.format(compiler)
+
+    assert out_buf.getvalue() == expected_buf.getvalue()
+
+
+def test_binary(compiler: Compiler) -> None:
     out_buf = BytesIO()
     formatter = Binary(out_buf)
 
-    run(in_buf, formatter, CompileSap)
+    formatter.format(compiler)
     out_buf.seek(0)
 
     assert out_buf.read() == bytes(
@@ -87,8 +105,7 @@ def test_run_binary(in_buf: StringIO) -> None:
 
 
 def test_run_stop_as_message() -> None:
-    in_buf = StringIO("lda init foo bar")
     formatter = BinaryText(StringIO())
 
     with pytest.raises(Message):
-        run(in_buf, formatter, CompileSap)
+        run("lda init foo bar", formatter, CompileSap)
@@ -1,11 +1,12 @@
+import sys
 from io import StringIO
 from typing import Callable, cast
 
 import pytest
 
-from wes.compilers.sap import CompileSap, Lda
+from wes.compilers.sap import CompileSap, Lda, Nop
 from wes.exceptions import Message
-from wes.instruction import Value
+from wes.instruction import Operation, Value
 from wes.parser import Op, Val
 
 from .utils import Eq, In, Re
@@ -18,6 +19,61 @@ class TestCompiler:
     def test_from_buf(self) -> None:
         assert list(CompileSap.from_buf(StringIO("255"))) == [255]
 
+    def test_assemble(self) -> None:
+        compiler = CompileSap.from_str("lda 1\nnop\n-1:\n255")
+        assert compiler.assemble() == bytes([0b00010001] + [0] * 14 + [255])
+        assert bytes(compiler) == compiler.assemble()
+
+    def test_assemble_checks_encoded_size(self) -> None:
+        class LongNop(Nop):
+            __slots__ = ()
+
+            def encode(self) -> bytes:
+                return b"\x00\x00"
+
+        class LongNopCompiler(CompileSap):
+            instructions = {**CompileSap.instructions, Nop.mnemonic: LongNop}
+
+        compiler = LongNopCompiler.from_str("nop\n-1:")
+        with pytest.raises(Exception, match="invariant"):
+            compiler.assemble()
+
+    def test_instructions_created_once(self) -> None:
+        created = []
+
+        class CountingLda(Lda):
+            __slots__ = ()
+
+            def validate(self) -> None:
+                created.append(self)
+                super().validate()
+
+        class CountingCompiler(CompileSap):
+            instructions = {**CompileSap.instructions, Lda.mnemonic: CountingLda}
+
+        compiler = CountingCompiler.from_str("lda 1\nlda 2\n-1:")
+        assert list(compiler) == [0b00010001] + [0b00010010] * 14
+        assert len(created) == 2
+
+    def test_scan_interns_nullary_mnemonics(self) -> None:
+        compiler = CompileSap.from_str("nop\nhlt")
+        compiler.scan()
+
+        for inst, _ in compiler.code:
+            mnemonic = cast(Operation, inst).op.mnemonic
+            assert mnemonic is sys.intern("".join(mnemonic))
+
+    def test_scan_once(self) -> None:
+        compiler = CompileSap.from_str("lda x\nx: 1\n-1:")
+        compiler.scan()
+        code = list(compiler.code)
+
+        compiler.scan()
+        assert compiler.code == code
+
+        assert compiler.assemble() == compiler.assemble()
+        assert list(compiler) == list(compiler)
+
     def test_get_instruction(self) -> None:
         compiler = CompileSap.from_str(
             """
@@ -75,6 +131,33 @@ fifteen: 0x44
         assert compiler.consts["z"] == 11
         assert compiler.consts["w"] == 22
 
+    def test_scan_code(self) -> None:
+        compiler = CompileSap.from_str(
+            """
+x = 5
+lda x
+loop:
+x
+jmp loop
++2:
+    """
+        )
+        compiler.scan()
+
+        # instructions are resolved once, in output order, with padding
+        # recorded as a repeat count
+        assert [count for _, count in compiler.code] == [1, 1, 1, 2]
+
+        lda_inst = cast(Lda, compiler.code[0][0])
+        assert isinstance(lda_inst, Lda)
+        assert lda_inst.op is compiler.file.stmts[1]
+
+        val_inst = cast(Value, compiler.code[1][0])
+        assert isinstance(val_inst, Value)
+        assert val_inst.val == Val(5)
+
+        assert compiler.code[3][0] is compiler.code[2][0]
+
     @pytest.mark.parametrize(
         "file_txt,check_msg",
         (
@@ -1,9 +1,10 @@
-from typing import Callable, List, Union
+from typing import Callable, List, Type, Union
 
 import pytest
 
 from wes.compiler import Compiler
 from wes.compilers.sap import CompileSap
+from wes.compilers.wdc import Compile6502
 from wes.exceptions import Message
 from wes.instruction import Word
 
@@ -16,6 +17,7 @@ from .utils import Eq, In, Predicate
         ("word 0", [0, 0]),
         ("word foo\nfoo: 1", [2, 0, 1]),
         ("256", Eq("evaluated result '256' is too large")),
+        ("0 - 5", Eq("evaluated result '-5' is negative")),
         ("hlt 42", Eq("'hlt' instruction takes no argument")),
         ("lda", Eq("'lda' instruction takes one argument")),
         ("hlt", [0xF0]),
@@ -58,3 +60,48 @@ def test_word_error(file_txt: str, check_msg: Callable[[str], bool]) -> None:
         list(compiler)
 
     assert check_msg(excinfo.value.msg)
+
+
+def test_word_literal_encoded_on_scan() -> None:
+    compiler = WordErrorCompiler.from_str("word 0x10000")
+    with pytest.raises(Message) as excinfo:
+        compiler.scan()
+
+    assert "does not fit in two bytes" in excinfo.value.msg
+
+    compiler = WordErrorCompiler.from_str("word 0x1234\nword foo\nfoo: word 0")
+    assert list(compiler) == [0x34, 0x12, 0x04, 0x00, 0x00, 0x00]
+
+
+@pytest.mark.parametrize(
+    "compiler_cls,file_txt",
+    (
+        (CompileSap, "lda 1\nnop\nword 0\n0"),
+        (Compile6502, "lda 1\nnop\nbbr0 0\n0"),
+    ),
+)
+def test_instruction_slots(compiler_cls: Type[Compiler], file_txt: str) -> None:
+    compiler = compiler_cls.from_str(file_txt)
+    compiler.scan()
+
+    for inst, _ in compiler.code:
+        with pytest.raises(AttributeError):
+            inst.__dict__
+
+
+@pytest.mark.parametrize(
+    "compiler_cls,file_txt",
+    (
+        (CompileSap, "lda 1\nlda foo\nnop\nword 0\nword foo\nfoo: 0"),
+        (Compile6502, "lda 1\nnop\nbbr0 0\nbeq 0\n0"),
+    ),
+)
+def test_instruction_encode(compiler_cls: Type[Compiler], file_txt: str) -> None:
+    compiler = compiler_cls.from_str(file_txt)
+    compiler.scan()
+
+    for inst, _ in compiler.code:
+        encoded = inst.encode()
+
+        assert isinstance(encoded, bytes)
+        assert len(encoded) == inst.size
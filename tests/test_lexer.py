@@ -1,3 +1,4 @@
+from io import StringIO
 from typing import Callable
 
 import pytest
@@ -124,6 +125,11 @@ incr: 1
     ]
 
 
+def test_lexer_from_buf() -> None:
+    text = "lda a\n\n; comment\nfoo: 42"
+    assert list(Lexer.from_buf(StringIO(text))) == list(Lexer.from_str(text))
+
+
 def test_lexer_comma() -> None:
     lexer = Lexer.from_str(
         """
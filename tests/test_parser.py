@@ -1,19 +1,34 @@
+import sys
 from io import StringIO
-from typing import Any, Dict, cast
+from typing import Any, Dict, Tuple, cast
 
 import pytest
 
 from wes.exceptions import Message, Stop, TokenError
+from wes.parser import NAME_RE
 from wes.parser import BinExpr as B
 from wes.parser import Const, Deref, Expr, File, Label
 from wes.parser import Name as N
 from wes.parser import Node, Offset, Op, Parser
 from wes.parser import UnExpr as U
 from wes.parser import Val as V
+from wes.parser import match_name
 
 from .utils import Eq, In, Predicate
 
 
+def test_node_kinds() -> None:
+    node_types = (File, Label, Const, Offset, Op, Deref, N, V, U, B)
+    kinds = [t.kind for t in node_types]
+
+    # each node type has a distinct tag
+    assert len(set(kinds)) == len(node_types)
+
+    # expression tags sort after all statement tags
+    assert all(t.kind >= Deref.kind for t in node_types if issubclass(t, Expr))
+    assert all(t.kind < Deref.kind for t in node_types if not issubclass(t, Expr))
+
+
 @pytest.fixture
 def count_parser() -> Parser:
     return Parser.from_str(
@@ -197,6 +212,26 @@ def test_parse_binary() -> None:
     assert file == File((Op("foo", (N("bar"), V(42))),))
 
 
+def test_parse_interns_mnemonics() -> None:
+    file = Parser.from_str("foo 1\nfoo 2, 3\n").parse_file()
+    op1, op2 = cast(Tuple[Op, Op], file.stmts)
+
+    assert op1.mnemonic is op2.mnemonic
+    assert op1.mnemonic is sys.intern("foo")
+
+
+def test_parse_interns_names() -> None:
+    file = Parser.from_str("x = 1\nbar:\nlda x\nfoo bar, x\nbar").parse_file()
+    const, label, op1, op2, name = cast(Tuple[Const, Label, Op, Op, N], file.stmts)
+
+    assert const.name is sys.intern("x")
+    assert label.name is sys.intern("bar")
+    assert cast(N, op1.args[0]).name is const.name
+    assert cast(N, op2.args[0]).name is label.name
+    assert cast(N, op2.args[1]).name is const.name
+    assert name.name is label.name
+
+
 def test_parser_from_buf() -> None:
     buf = StringIO("foo")
     parser = Parser.from_buf(buf)
@@ -461,3 +496,33 @@ def test_expr_eval(file_txt: str, scope: Dict[str, int], expected: Any) -> None:
             expr.eval(scope)
 
         assert expected(excinfo.value.msg)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ("a", "_", "lda", "count_up", "r1", "_0", "A_b9", "1a", "a-b", "é", "aé", "a\n"),
+)
+def test_match_name(text: str) -> None:
+    assert match_name(text) == (NAME_RE.fullmatch(text) is not None)
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    (
+        ("x = 1", ("parse_const",)),
+        ("foo:", ("parse_offset", "parse_label")),
+        ("0xff:", ("parse_offset", "parse_label")),
+        ("+2:", ("parse_const", "parse_offset", "parse_label")),
+        ("-1:", ("parse_const", "parse_offset", "parse_label")),
+        ("lda 1", ()),
+        ("lda [x + y]", ()),
+        ("nop", ()),
+        ("", ()),
+    ),
+)
+def test_directive_parsers(text: str, expected: Tuple[str, ...]) -> None:
+    parser = Parser.from_str(text)
+
+    assert tuple(p.__name__ for p in parser.directive_parsers()) == expected
+    # lookahead doesn't consume any tokens
+    assert parser.toks.mark() == 0
@@ -11,6 +11,8 @@ def test_str_to_int() -> None:
     assert str_to_int("0x2a") == 42
     assert str_to_int("42") == 42
     assert str_to_int("0042") == 42
+    assert str_to_int("4_2") == 42
+    assert str_to_int("0x_2a") == 42
 
 
 def test_byte_length() -> None:
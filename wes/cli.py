@@ -1,7 +1,5 @@
 import argparse
-import shutil
 import sys
-from io import StringIO
 from typing import BinaryIO, Generic, TextIO, Type, TypeVar
 
 from wes.compiler import Compiler
@@ -22,42 +20,35 @@ class Formatter(Generic[IoType]):
         raise NotImplementedError("must implement `format`")
 
 
-class BinaryText(Formatter[TextIO]):
-    def format(self, compiler: Compiler) -> None:
-        for i, code in enumerate(compiler):
-            print(f"{i:04b}: {code >> 4:04b} {code & 15:04b}", file=self.buf)
-
+# binary text representations of all byte values, split into nibbles
+BYTES = tuple(f"{b >> 4:04b} {b & 15:04b}" for b in range(256))
 
-class ReadCompiler:
-    def __init__(self, compiler: Compiler):
-        self.it = iter(compiler)
 
-    def read(self, n: int = -1) -> bytes:
-        bs = []
+class BinaryText(Formatter[TextIO]):
+    # number of output lines formatted per write to the buffer
+    chunk_size = 4096
 
-        try:
-            if n == -1:
-                while True:  # pragma: no cover
-                    bs.append(next(self.it))
-            else:
-                for _ in range(n):
-                    bs.append(next(self.it))
-        except StopIteration:
-            pass
+    def format(self, compiler: Compiler) -> None:
+        # slice chunks from a view to avoid copying the output
+        code = memoryview(compiler.assemble())
 
-        return bytes(bs)
+        for start in range(0, len(code), self.chunk_size):
+            chunk = code[start : start + self.chunk_size]
+            self.buf.write(
+                "".join(f"{i:04b}: {BYTES[b]}\n" for i, b in enumerate(chunk, start))
+            )
 
 
 class Binary(Formatter[BinaryIO]):
     def format(self, compiler: Compiler) -> None:
-        shutil.copyfileobj(ReadCompiler(compiler), self.buf)
+        self.buf.write(compiler.assemble())
 
 
 def run(
-    in_buf: TextIO, formatter: Formatter[IoType], compiler_cls: Type[Compiler]
+    file_txt: str, formatter: Formatter[IoType], compiler_cls: Type[Compiler]
 ) -> None:
     try:
-        compiler = compiler_cls.from_buf(in_buf)
+        compiler = compiler_cls.from_str(file_txt)
     except Stop as e:
         raise Message(e.msg, e.toks)
 
@@ -106,10 +97,9 @@ def main():  # pragma: no cover
     compiler_cls = COMPILERS[args.arch]
 
     file_txt = args.file.read()
-    in_buf = StringIO(file_txt)
 
     try:
-        run(in_buf, formatter, compiler_cls)
+        run(file_txt, formatter, compiler_cls)
     except Message as e:
         print(e.render(file_txt), file=sys.stderr)
         sys.exit(1)
@@ -1,19 +1,48 @@
 from __future__ import annotations
 
-from typing import Dict, Iterator, TextIO, Type, TypeVar, cast, overload
+from typing import (
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    TextIO,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
 
 from wes.exceptions import Message
 from wes.instruction import Instruction, Operation, Value
-from wes.parser import Const, Expr, File, Label, Name, Offset, Op, Parser, Val
+from wes.parser import (
+    KIND_CONST,
+    KIND_DEREF,
+    KIND_LABEL,
+    KIND_NAME,
+    KIND_OFFSET,
+    KIND_OP,
+    KIND_VAL,
+    Const,
+    Expr,
+    File,
+    Label,
+    Name,
+    Offset,
+    Op,
+    Parser,
+    Val,
+)
 
 T = TypeVar("T")
 
 
 class Compiler:
-    max_addr = 2**64 - 1
-    max_val = 2**64 - 1
+    max_addr: ClassVar[int] = 2**64 - 1
+    max_val: ClassVar[int] = 2**64 - 1
 
-    instructions: Dict[str, Type[Operation]] = {}
+    instructions: ClassVar[Dict[str, Type[Operation]]] = {}
 
     file: File
 
@@ -21,12 +50,21 @@ class Compiler:
     consts: Dict[str, int]
     scope: Dict[str, int]
 
+    # instructions in output order, each paired with the number of times it is
+    # emitted (more than once when used as padding for an offset)
+    code: List[Tuple[Instruction, int]]
+
+    _scanned: bool
+
     def __init__(self, file: File):
         self.file = file
 
         self.labels = {}
         self.consts = {}
         self.scope = {}
+        self.code = []
+
+        self._scanned = False
 
     @classmethod
     def from_str(cls: Type[T], text: str) -> T:
@@ -51,70 +89,94 @@ class Compiler:
         ...
 
     def get_instruction(self, stmt):
-        if isinstance(stmt, Op):
-            try:
-                instruction_cls = self.instructions[stmt.mnemonic]
-            except KeyError:
+        kind = stmt.kind
+
+        if kind == KIND_OP:
+            instruction_cls = self.instructions.get(stmt.mnemonic)
+            if instruction_cls is None:
                 raise Message(
                     f"unrecognized instruction '{stmt.mnemonic}'", (stmt.toks[0],)
                 )
             return instruction_cls(self, stmt)
-        elif isinstance(stmt, Val):
+        elif kind == KIND_VAL:
             return Value(self, stmt)
         else:  # pragma: no cover
             raise Exception("invariant")
 
     def scan(self) -> None:
+        # the results of a scan don't change, so only do it once
+        if self._scanned:
+            return
+
         self.find_consts()
         self.find_labels()
 
+        self._scanned = True
+
     def find_consts(self) -> None:
-        const_stmts = []
+        instructions = self.instructions
+        consts = self.consts
+
+        # Constants may be referenced before they're defined, so they're
+        # evaluated in a pass of their own ahead of `find_labels`.  Only
+        # constant statements are visited after they're picked out here.
+        const_stmts = [
+            cast(Const, stmt) for stmt in self.file.stmts if stmt.kind == KIND_CONST
+        ]
+
         const_names = set()
-        for stmt in self.file.stmts:
-            if isinstance(stmt, Const):
-                if stmt.name in self.instructions:
-                    raise Message(
-                        f"constant '{stmt.name}' uses reserved name", stmt.toks
-                    )
-                if stmt.name in const_names:
-                    raise Message(f"redefinition of constant '{stmt.name}'", stmt.toks)
+        for stmt in const_stmts:
+            name = stmt.name
+
+            if name in instructions:
+                raise Message(f"constant '{name}' uses reserved name", stmt.toks)
+            if name in const_names:
+                raise Message(f"redefinition of constant '{name}'", stmt.toks)
 
-                const_stmts.append(stmt)
-                const_names.add(stmt.name)
+            const_names.add(name)
 
         for stmt in const_stmts:
-            self.consts[stmt.name] = stmt.val.eval(self.consts)
+            consts[stmt.name] = stmt.val.eval(consts)
 
         self.scope.update(self.consts)
 
     def find_labels(self) -> None:
+        # bind frequently used attributes to locals for the scan loop
+        max_addr = self.max_addr
+        instructions = self.instructions
+        labels = self.labels
+        consts = self.consts
+        scope = self.scope
+        get_instruction = self.get_instruction
+        add_code = self.code.append
+
         last_inst = None
         loc = 0
 
         for stmt in self.file.stmts:
-            if isinstance(stmt, Const):
+            kind = stmt.kind
+
+            if kind == KIND_CONST:
                 pass  # already handled in first pass
 
-            elif isinstance(stmt, Label):
-                if stmt.name in self.instructions:
-                    raise Message(
-                        f"label '{stmt.name}' uses reserved name", (stmt.toks[0],)
-                    )
-                if stmt.name in self.labels:
-                    raise Message(
-                        f"redefinition of label '{stmt.name}'", (stmt.toks[0],)
-                    )
-                if stmt.name in self.consts:
+            elif kind == KIND_LABEL:
+                name = cast(Label, stmt).name
+
+                if name in instructions:
+                    raise Message(f"label '{name}' uses reserved name", (stmt.toks[0],))
+                if name in labels:
+                    raise Message(f"redefinition of label '{name}'", (stmt.toks[0],))
+                if name in consts:
                     raise Message(
-                        f"label name '{stmt.name}' collides with constant name",
+                        f"label name '{name}' collides with constant name",
                         (stmt.toks[0],),
                     )
 
-                self.labels[stmt.name] = loc
-                self.scope[stmt.name] = loc
+                labels[name] = loc
+                scope[name] = loc
 
-            elif isinstance(stmt, Offset):
+            elif kind == KIND_OFFSET:
+                stmt = cast(Offset, stmt)
                 offset_loc = self.resolve_offset(loc, stmt)
 
                 if last_inst is None:
@@ -137,25 +199,32 @@ class Compiler:
                     else:  # pragma: no cover
                         raise Exception("invariant")
 
+                if padding_len > 0:
+                    add_code((last_inst, padding_len // last_inst.size))
+
                 loc = offset_loc
 
-            elif isinstance(stmt, (Op, Expr)):
-                if loc > self.max_addr:
+            elif kind == KIND_OP or kind >= KIND_DEREF:
+                if loc > max_addr:
                     raise Message("statement makes program too large", (stmt.toks[0],))
 
-                if isinstance(stmt, Name):
-                    if stmt.name in self.consts:
+                if kind == KIND_NAME:
+                    stmt = cast(Name, stmt)
+                    if stmt.name in consts:
                         # rewrite constant names with their resolved values
-                        stmt = Val(self.consts[stmt.name], toks=stmt.toks)
+                        stmt = Val(consts[stmt.name], toks=stmt.toks)
                     else:
                         # rewrite other free standing names as nullary ops
                         stmt = Op(stmt.name, (), toks=stmt.toks)
-                elif isinstance(stmt, Expr):
+                elif kind != KIND_OP and kind != KIND_VAL:
                     # rewrite any other expression as a literal value after
                     # evaluation
-                    stmt = Val(stmt.eval(self.scope), toks=stmt.toks)
+                    stmt = Val(cast(Expr, stmt).eval(scope), toks=stmt.toks)
+
+                # dispatching on `kind` doesn't narrow the statement's type
+                last_inst = get_instruction(cast(Union[Op, Val], stmt))
+                add_code((last_inst, 1))
 
-                last_inst = self.get_instruction(stmt)
                 loc += last_inst.size
 
             else:  # pragma: no cover
@@ -185,47 +254,36 @@ class Compiler:
 
         return offset_loc
 
-    def __iter__(self) -> Iterator[int]:
+    def assemble(self) -> bytes:
+        """
+        Compile the program and return the generated code as a byte string.
+        """
         self.scan()
 
-        last_inst = None
-        loc = 0
-
-        for stmt in self.file.stmts:
-            if isinstance(stmt, (Op, Expr)):
-                if isinstance(stmt, Name):
-                    if stmt.name in self.consts:
-                        # rewrite constant names with their resolved values
-                        stmt = Val(self.consts[stmt.name], toks=stmt.toks)
-                    else:
-                        # rewrite other free standing names as nullary ops
-                        stmt = Op(stmt.name, (), toks=stmt.toks)
-                elif isinstance(stmt, Expr):
-                    # rewrite any other expression as a literal value after
-                    # evaluation
-                    stmt = Val(stmt.eval(self.scope), toks=stmt.toks)
-
-                last_inst = self.get_instruction(stmt)
-                yield from last_inst.encode()
-
-                loc += last_inst.size
-
-            elif isinstance(stmt, Offset):
-                offset_loc = self.resolve_offset(loc, stmt)
+        # All locations and offsets were resolved by `scan`, so the size of the
+        # output is known up front.  Only the encoding of each instruction
+        # remains.
+        code = self.code
+        buf = bytearray(sum(inst.size * count for inst, count in code))
+
+        pos = 0
+        for inst, count in code:
+            encoded = inst.encode()
+            if count != 1:
+                encoded *= count
+
+            # a wrong size would silently resize the buffer on assignment
+            end = pos + inst.size * count
+            if len(encoded) != end - pos:
+                raise Exception("invariant")
 
-                # We know this from the `scan` pass.  Scan will throw an error
-                # if an offset is not preceded by a padding instruction.
-                last_inst = cast(Instruction, last_inst)
+            buf[pos:end] = encoded
+            pos = end
 
-                padding_len = offset_loc - loc
-                output_len = 0
-                for _ in range(padding_len // last_inst.size):
-                    yield from last_inst.encode()
-                    output_len += last_inst.size
+        return bytes(buf)
 
-                if padding_len != output_len:  # pragma: no cover
-                    Exception("invariant")
+    def __bytes__(self) -> bytes:
+        return self.assemble()
 
-                loc = offset_loc
-
-            # no other statement types cause code generation...
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.assemble())
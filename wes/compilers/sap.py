@@ -1,75 +1,125 @@
-from typing import Iterator
+from typing import ClassVar
 
 from wes.compiler import Compiler
 from wes.exceptions import Message
 from wes.instruction import Constant, Unary, Word
+from wes.parser import KIND_VAL, Expr
 
 
 class SapUnary(Unary):
+    __slots__ = ("_output",)  # type: ignore
+
     size = 1  # type: ignore
     code: int = None  # type: ignore
 
-    def encode(self) -> Iterator[int]:
+    # op code shifted into the high nibble, computed once per subclass
+    _code_hi: ClassVar[int]
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+
+        # only classes that define an op code have one to precompute
+        if "code" in cls.__dict__:
+            cls._code_hi = cls.code << 4
+
+    def validate(self) -> None:
+        super().validate()
+
+        # An operation with a literal argument doesn't depend on any names in
+        # scope.  Encode it once up front instead of on every emit.
         arg = self.op.args[0]
+        self._output = self._encode_arg(arg) if arg.kind == KIND_VAL else None
+
+    def _encode_arg(self, arg: Expr) -> bytes:
         evaled = arg.eval(self.compiler.scope)
 
         if evaled > self.compiler.max_addr:
             raise Message(f"evaluated result '{evaled}' is too large", arg.toks)
+        if evaled < 0:
+            raise Message(f"evaluated result '{evaled}' is negative", arg.toks)
+
+        return bytes((self._code_hi + evaled,))
+
+    def encode(self) -> bytes:
+        if self._output is not None:
+            return self._output
 
-        yield (self.code << 4) + evaled
+        return self._encode_arg(self.op.args[0])
 
 
 class Nop(Constant):
+    __slots__ = ()
+
     mnemonic = "nop"
     output = 0b00000000
 
 
 class Lda(SapUnary):
+    __slots__ = ()
+
     mnemonic = "lda"
     code = 0b0001
 
 
 class Add(SapUnary):
+    __slots__ = ()
+
     mnemonic = "add"
     code = 0b0010
 
 
 class Sub(SapUnary):
+    __slots__ = ()
+
     mnemonic = "sub"
     code = 0b0011
 
 
 class Sta(SapUnary):
+    __slots__ = ()
+
     mnemonic = "sta"
     code = 0b0100
 
 
 class Ldi(SapUnary):
+    __slots__ = ()
+
     mnemonic = "ldi"
     code = 0b0101
 
 
 class Jmp(SapUnary):
+    __slots__ = ()
+
     mnemonic = "jmp"
     code = 0b0110
 
 
 class Jc(SapUnary):
+    __slots__ = ()
+
     mnemonic = "jc"
     code = 0b0111
 
 
 class Jz(SapUnary):
+    __slots__ = ()
+
     mnemonic = "jz"
     code = 0b1000
 
 
 class Out(Constant):
+    __slots__ = ()
+
     mnemonic = "out"
     output = 0b11100000
 
 
 class Hlt(Constant):
+    __slots__ = ()
+
     mnemonic = "hlt"
     output = 0b11110000
 
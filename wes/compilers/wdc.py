@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Dict, Iterator, Tuple, Optional
+from typing import Dict, Optional, Tuple, cast
 
 from wes.compiler import Compiler
-from wes.exceptions import Message, PatternError
+from wes.exceptions import Message
 from wes.instruction import Constant, Unary
-from wes.parser import BinExpr, Deref, Expr, Name
-from wes.pattern import Pattern, T
+from wes.parser import KIND_BIN_EXPR, KIND_DEREF, KIND_NAME, BinExpr, Deref, Expr, Name
+from wes.pattern import T
 from wes.utils import byte_length, le_bytes
 
 
@@ -34,17 +34,47 @@ class Format(Enum):
     IMM = T
 
     @staticmethod
-    def match(arg: Pattern) -> Tuple[Format, Expr]:
-        for fmt in Format:
-            try:
-                subs = arg.unify(fmt.value)
-            except PatternError:
-                continue
-            else:
-                return fmt, subs[T]
-
-        # an arg should always at least match the "immediate" format
-        raise Exception("invariant")  # pragma: no cover
+    def match(arg: Expr) -> Tuple[Format, Expr]:
+        """
+        Find the first format whose pattern unifies with ``arg`` along with the
+        operand bound to ``T``.  The shape of ``arg`` is checked directly since
+        running the unifier against each format is slow.
+        """
+        if arg.kind != KIND_DEREF:
+            return Format.IMM, arg
+
+        inner = cast(Deref, arg).expr
+
+        if inner.kind == KIND_DEREF:
+            operand = cast(Deref, inner).expr
+            if index_reg(operand) == "x":
+                return Format.IDX_IND, cast(BinExpr, operand).x
+            return Format.IND, operand
+
+        reg = index_reg(inner)
+        if reg is not None:
+            operand = cast(BinExpr, inner).x
+            if reg == "y" and operand.kind == KIND_DEREF:
+                return Format.IND_Y, cast(Deref, operand).expr
+            elif reg == "x":
+                return Format.IDX_X, operand
+            elif reg == "y":
+                return Format.IDX_Y, operand
+
+        return Format.DIR, inner
+
+
+def index_reg(expr: Expr) -> Optional[str]:
+    """
+    Return the name added to an indexed expression of the form ``... + name``
+    or ``None`` if ``expr`` doesn't have that form.
+    """
+    if expr.kind == KIND_BIN_EXPR:
+        bin_expr = cast(BinExpr, expr)
+        if bin_expr.op == "+" and bin_expr.y.kind == KIND_NAME:
+            return cast(Name, bin_expr.y).name
+
+    return None
 
 
 FORMAT_NAMES = {
@@ -59,7 +89,7 @@ FORMAT_NAMES = {
 
 
 class WdcUnary(Unary):
-    __slots__ = ("_op_code", "_le_bytes", "_size")  # type: ignore
+    __slots__ = ("_output",)  # type: ignore
 
     op_codes: Dict[Optional[Tuple[Format, int]], int] = {
         # (arg format, arg byte length): opcode,
@@ -77,9 +107,7 @@ class WdcUnary(Unary):
                     f"instruction '{self.mnemonic}' expects an argument", self.op.toks
                 )
 
-            self._op_code = op_code
-            self._le_bytes = ()
-            self._size = 1
+            self._output = bytes((op_code,))
 
         elif n_args == 1:
             fmt, arg = Format.match(self.op.args[0])
@@ -103,26 +131,23 @@ class WdcUnary(Unary):
                     arg.toks,
                 )
 
-            self._op_code = op_code
-            self._le_bytes = le_bytes(evaled, b_len)
-            self._size = b_len + 1
+            self._output = bytes((op_code, *le_bytes(evaled, b_len)))
 
         else:
             raise Message(
                 f"instruction '{self.mnemonic}' expects one argument", self.op.toks
             )
 
-    def encode(self) -> Iterator[int]:
-        yield self._op_code
-        yield from self._le_bytes
+    def encode(self) -> bytes:
+        return self._output
 
     @property
     def size(self) -> int:
-        return self._size
+        return len(self._output)
 
 
 class RelativeUnary(Unary):
-    __slots__ = ("_evaled",)  # type: ignore
+    __slots__ = ("_output",)  # type: ignore
 
     op_code: int = None  # type: ignore
     size = 2  # type: ignore
@@ -138,29 +163,32 @@ class RelativeUnary(Unary):
             arg = self.op.args[0]
             evaled = arg.eval(self.compiler.scope)
 
-            b_len = byte_length(evaled)
-            if b_len > 1:
+            # negative offsets are encoded as two's complement
+            if not -0x80 <= evaled <= 0xFF:
                 raise Message(
                     f"evaluated result '{evaled}' does not fit in one byte", arg.toks
                 )
 
-            self._evaled = evaled
+            self._output = bytes((self.op_code, evaled & 0xFF))
         else:
             raise Message(
                 f"instruction '{self.mnemonic}' expects one argument", self.op.toks
             )
 
-    def encode(self) -> Iterator[int]:
-        yield self.op_code
-        yield self._evaled
+    def encode(self) -> bytes:
+        return self._output
 
 
 class Nop(Constant):
+    __slots__ = ()
+
     mnemonic = "nop"
     output = 0xEA
 
 
 class Adc(WdcUnary):
+    __slots__ = ()
+
     mnemonic = "adc"
 
     op_codes = {
@@ -177,6 +205,8 @@ class Adc(WdcUnary):
 
 
 class And(WdcUnary):
+    __slots__ = ()
+
     mnemonic = "and"
 
     op_codes = {
@@ -193,6 +223,8 @@ class And(WdcUnary):
 
 
 class Asl(WdcUnary):
+    __slots__ = ()
+
     mnemonic = "asl"
 
     op_codes = {
@@ -205,101 +237,141 @@ class Asl(WdcUnary):
 
 
 class Bbr0(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbr0"
     op_code = 0x0F
 
 
 class Bbr1(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbr1"
     op_code = 0x1F
 
 
 class Bbr2(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbr2"
     op_code = 0x2F
 
 
 class Bbr3(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbr3"
     op_code = 0x3F
 
 
 class Bbr4(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbr4"
     op_code = 0x4F
 
 
 class Bbr5(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbr5"
     op_code = 0x5F
 
 
 class Bbr6(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbr6"
     op_code = 0x6F
 
 
 class Bbr7(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbr7"
     op_code = 0x7F
 
 
 class Bbs0(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbs0"
     op_code = 0x8F
 
 
 class Bbs1(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbs1"
     op_code = 0x9F
 
 
 class Bbs2(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbs2"
     op_code = 0xAF
 
 
 class Bbs3(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbs3"
     op_code = 0xBF
 
 
 class Bbs4(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbs4"
     op_code = 0xCF
 
 
 class Bbs5(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbs5"
     op_code = 0xDF
 
 
 class Bbs6(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbs6"
     op_code = 0xEF
 
 
 class Bbs7(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bbs7"
     op_code = 0xFF
 
 
 class Bcc(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bcc"
     op_code = 0x90
 
 
 class Bcs(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "bcs"
     op_code = 0xB0
 
 
 class Beq(RelativeUnary):
+    __slots__ = ()
+
     mnemonic = "beq"
     op_code = 0xF0
 
 
 class Lda(WdcUnary):
+    __slots__ = ()
+
     mnemonic = "lda"
 
     op_codes = {
@@ -316,6 +388,8 @@ class Lda(WdcUnary):
 
 
 class Ldx(WdcUnary):
+    __slots__ = ()
+
     mnemonic = "ldx"
 
     op_codes = {
@@ -69,7 +69,7 @@ class Message(Exception):
                 raise Exception("invariant")
             marker_len = max(1, marker_end - marker_start)
 
-        marker_string = " " * marker_start + "^" * marker_len
+        marker_string = ("^" * marker_len).rjust(marker_start + marker_len)
 
         # fmt:off
         return f"""
@@ -1,17 +1,17 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Iterator
+from typing import TYPE_CHECKING, ClassVar, Tuple
 
 from wes.exceptions import Message
-from wes.parser import Op, Val
-from wes.utils import byte_length
+from wes.parser import KIND_VAL, Expr, Op, Val
+from wes.utils import byte_length, le_bytes
 
 if TYPE_CHECKING:  # pragma: no cover
     from wes.compiler import Compiler
 
 
 class Instruction:
-    __slots__ = ("compiler",)
+    __slots__: Tuple[str, ...] = ("compiler",)
 
     compiler: Compiler
 
@@ -22,7 +22,7 @@ class Instruction:
     def validate(self) -> None:  # pragma: no cover
         raise NotImplementedError("must define `validate`")
 
-    def encode(self) -> Iterator[int]:  # pragma: no cover
+    def encode(self) -> bytes:  # pragma: no cover
         raise NotImplementedError("must define `encode`")
 
     @property
@@ -37,34 +37,45 @@ class Operation(Instruction):
     op: Op
 
     def __init__(self, compiler: Compiler, op: Op):
+        # set everything here rather than calling `Instruction.__init__` since
+        # one of these is created for every operation in a program
+        self.compiler = compiler
         self.op = op
-        super().__init__(compiler)
+        self.validate()
 
 
 class Value(Instruction):
-    __slots__ = ("val",)
+    __slots__ = ("val", "_output", "_size")  # type: ignore
 
     val: Val
 
     def __init__(self, compiler: Compiler, val: Val):
+        self.compiler = compiler
         self.val = val
-        super().__init__(compiler)
+        self.validate()
 
     def validate(self) -> None:
-        if self.val.val > self.compiler.max_val:
-            raise Message(
-                f"evaluated result '{self.val.val}' is too large", self.val.toks
-            )
+        val = self.val.val
+
+        if val > self.compiler.max_val:
+            raise Message(f"evaluated result '{val}' is too large", self.val.toks)
+        if val < 0:
+            raise Message(f"evaluated result '{val}' is negative", self.val.toks)
+
+        self._size = byte_length(val)
+        self._output = bytes(le_bytes(val, self._size))
 
-    def encode(self) -> Iterator[int]:
-        yield self.val.val
+    def encode(self) -> bytes:
+        return self._output
 
     @property
     def size(self) -> int:
-        return byte_length(self.val.val)
+        return self._size
 
 
 class Nullary(Operation):
+    __slots__ = ()
+
     def validate(self) -> None:
         if len(self.op.args) > 0:
             raise Message(
@@ -74,6 +85,8 @@ class Nullary(Operation):
 
 
 class Unary(Operation):
+    __slots__ = ()
+
     def validate(self) -> None:
         if len(self.op.args) != 1:
             raise Message(
@@ -83,24 +96,47 @@ class Unary(Operation):
 
 
 class Constant(Nullary):
+    __slots__ = ()
+
     output: int = None  # type: ignore
 
-    def encode(self) -> Iterator[int]:
-        yield self.output
+    # encoded output and its byte length, computed once per subclass
+    _output: ClassVar[bytes]
+    _size: ClassVar[int]
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+
+        # only classes that define an output have one to precompute
+        if "output" in cls.__dict__:
+            cls._output = bytes((cls.output,))
+            cls._size = byte_length(cls.output)
+
+    def encode(self) -> bytes:
+        return self._output
 
     @property
     def size(self) -> int:
-        return byte_length(self.output)
+        return self._size
 
 
 MAX_WORD = 2**16 - 1
 
 
 class Word(Unary):
+    __slots__ = ("_output",)  # type: ignore
+
     mnemonic = "word"
 
-    def encode(self) -> Iterator[int]:
+    def validate(self) -> None:
+        super().validate()
+
+        # Other arguments may refer to labels that haven't been found yet.  A
+        # literal can be encoded now.
         arg = self.op.args[0]
+        self._output = self._encode_arg(arg) if arg.kind == KIND_VAL else None
+
+    def _encode_arg(self, arg: Expr) -> bytes:
         evaled = arg.eval(self.compiler.scope)
 
         if evaled > MAX_WORD:
@@ -108,8 +144,13 @@ class Word(Unary):
                 f"evaluated result '{evaled}' does not fit in two bytes", arg.toks
             )
 
-        yield evaled & 0xFF
-        yield (evaled >> 8) & 0xFF
+        return bytes((evaled & 0xFF, (evaled >> 8) & 0xFF))
+
+    def encode(self) -> bytes:
+        if self._output is not None:
+            return self._output
+
+        return self._encode_arg(self.op.args[0])
 
     @property
     def size(self) -> int:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from io import StringIO
+import re
 from typing import Any, Callable, Iterator, List, TextIO
 
 from wes.exceptions import EndOfTokens, Message
@@ -10,50 +10,26 @@ COMMENT_CHR = ";"
 # each occurrence of these characters will all be treated as separate tokens
 DISJOINED = "-~+/^&|%:,[]()"
 
+# Regions of the same character type in the order they're tried.  Runs of
+# whitespace and of the operator characters "*", "<", ">", and "=" are kept
+# together while each disjoined character is split out on its own.
+TOKEN_RE = re.compile(
+    r"\s+|\*+|<+|>+|=+|"
+    + f"[{re.escape(DISJOINED)}]|"
+    + f"[^\\s*<>={re.escape(DISJOINED)}]+"
+)
 
-def _char_type(c: str) -> Any:
-    """
-    Helper function for the low-level tokenizer.  All that matters is that this
-    function outputs values that are considered different by the equality
-    operator for different character regions.
-    """
-    if c.isspace():
-        return 0
-    elif c == "*":
-        return 1
-    elif c == "<":
-        return 2
-    elif c == ">":
-        return 3
-    elif c == "=":
-        return 4
-    elif c in DISJOINED:
-        return float("nan")
-    else:
-        return 5
-
-
-def tokenize(s: str, *, split_f: Callable[[str], Any] = _char_type) -> Iterator[str]:
+# matches lines with no content other than whitespace or a comment
+EMPTY_LINE_RE = re.compile(rf"\s*(?:{re.escape(COMMENT_CHR)}|\Z)")
+
+
+def tokenize(s: str) -> List[str]:
     """
     Split a string into regions of differing character types.
     """
-    if len(s) == 0:
-        return
-
-    last_pos = 0
-    last_type = split_f(s[0])
-    i = 1
-
-    while i < len(s):
-        curr_type = split_f(s[i])
-        if curr_type != last_type:
-            yield s[last_pos:i]
-            last_pos = i
-
-        last_type = curr_type
-        i += 1
-
-    yield s[last_pos:]
+    # `findall` builds the list of matched strings in C without creating a
+    # match object per token
+    return TOKEN_RE.findall(s)
 
 
 class Token:
@@ -74,6 +50,9 @@ class Token:
         self.col = col
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+
         return type(self) is type(other) and (
             self.line_start == other.line_start
             and self.line_num == other.line_num
@@ -110,6 +89,9 @@ class Text(Token):
         )
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+
         return type(self) is type(other) and (
             self.text == other.text
             and self.line_start == other.line_start
@@ -119,11 +101,15 @@ class Text(Token):
 
 
 class Newline(Token):
+    __slots__ = ()
+
     def __repr__(self) -> str:  # pragma: no cover
         return f"Newline({self.line_start}, {self.line_num}, {self.col})"
 
 
 class Eof(Token):
+    __slots__ = ()
+
     def __repr__(self) -> str:  # pragma: no cover
         return f"Eof({self.line_start}, {self.line_num}, {self.col})"
 
@@ -137,9 +123,9 @@ class EndOfBuffer(Exception):
 
 
 class Lexer:
-    __slots__ = ("buf", "line_num", "pos", "delims")
+    __slots__ = ("text", "line_num", "pos", "delims")
 
-    buf: TextIO
+    text: str
 
     line_num: int
     pos: int
@@ -150,8 +136,8 @@ class Lexer:
         "(": ")",
     }
 
-    def __init__(self, buf: TextIO):
-        self.buf = buf
+    def __init__(self, text: str):
+        self.text = text
 
         self.line_num = 0
         self.pos = 0
@@ -176,16 +162,27 @@ class Lexer:
 
     @classmethod
     def from_str(cls, text: str) -> Lexer:
-        buf = StringIO(text)
-        return cls(buf)
+        return cls(text)
+
+    @classmethod
+    def from_buf(cls, buf: TextIO) -> Lexer:
+        # read the whole buffer once so lines can be sliced out of one string
+        return cls(buf.read())
 
     def get_line(self) -> str:
-        line = self.buf.readline()
-        if len(line) == 0:
+        # `pos` is always the start of the next line when this is called
+        start = self.pos
+        if start >= len(self.text):
             raise EndOfBuffer()
 
+        end = self.text.find("\n", start)
+        if end == -1:
+            end = len(self.text)
+        else:
+            end += 1
+
         self.line_num += 1
-        return line
+        return self.text[start:end]
 
     def __iter__(self) -> Iterator[Token]:
         line = None
@@ -215,20 +212,20 @@ class Lexer:
                     )
                     return
 
-                stripped = line.strip()
-                is_empty_line = len(stripped) == 0 or stripped.startswith(COMMENT_CHR)
-
-                if not is_empty_line:
+                if EMPTY_LINE_RE.match(line) is None:
                     break
 
                 self.pos += len(line)
 
             col = 0
             for part in tokenize(line):
-                if part.isspace():
+                # each part holds a single type of character, so its first
+                # character identifies it
+                c = part[0]
+                if c.isspace():
                     col += len(part)
                     continue
-                elif part.startswith(COMMENT_CHR):
+                elif c == COMMENT_CHR:
                     # We've hit a comment.  No more tokens coming from this
                     # line.
                     break
@@ -255,26 +252,32 @@ class Lexer:
 
 
 class TokenStream:
-    __slots__ = ("toks", "hist", "i")
+    __slots__ = ("toks", "next_tok", "hist", "i")
 
     toks: Iterator[Token]
+    next_tok: Callable[[], Token]
     hist: List[Token]
     i: int
 
     def __init__(self, lexer: Lexer):
         self.toks = iter(lexer)
+        self.next_tok = self.toks.__next__
         self.hist = []
         self.i = 0
 
     def peek(self) -> Token:
-        if self.i < len(self.hist):
-            tok = self.hist[self.i]
-        else:
-            try:
-                tok = next(self.toks)
-            except StopIteration:
-                raise EndOfTokens("end of tokens")
-            self.hist.append(tok)
+        hist = self.hist
+        i = self.i
+
+        # already read tokens are the common case when backtracking
+        if i < len(hist):
+            return hist[i]
+
+        try:
+            tok = self.next_tok()
+        except StopIteration:
+            raise EndOfTokens("end of tokens")
+        hist.append(tok)
 
         return tok
 
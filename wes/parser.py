@@ -16,11 +16,14 @@ import contextlib
 import functools
 import operator
 import re
+import sys
 from typing import (
     Any,
     Callable,
+    ClassVar,
     Dict,
     Iterator,
+    List,
     Optional,
     TextIO,
     Tuple,
@@ -35,17 +38,46 @@ from wes.lexer import Eof, Lexer, Newline, Text, TokenStream
 from wes.pattern import Pattern
 from wes.utils import serialize_dict, str_to_int
 
-NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
-VAL_RE = re.compile(r"^(0b[01_]+|0o[0-7_]+|[0-9][0-9_]*|0x[a-fA-F0-9_]+)$")
+NAME_RE = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+VAL_RE = re.compile(r"0b[01_]+|0o[0-7_]+|[0-9][0-9_]*|0x[a-fA-F0-9_]+")
+
+# bound once since this is called for most tokens in a program
+match_val = VAL_RE.fullmatch
+
+
+def match_name(s: str) -> bool:
+    """
+    Return ``True`` if ``s`` is a valid name.  Equivalent to a full match of
+    ``NAME_RE`` since ASCII identifiers are made up of the same characters,
+    but avoids the overhead of the regex engine.
+    """
+    return s.isascii() and s.isidentifier()
+
 
 T = TypeVar("T")
 
+# Integer tags identifying each node type.  Dispatching on `Node.kind` is
+# cheaper than a chain of `isinstance` checks in hot loops.  Expression kinds
+# are numbered last so that `kind >= KIND_DEREF` identifies an expression.
+KIND_FILE = 0
+KIND_LABEL = 1
+KIND_CONST = 2
+KIND_OFFSET = 3
+KIND_OP = 4
+KIND_DEREF = 5
+KIND_NAME = 6
+KIND_VAL = 7
+KIND_UN_EXPR = 8
+KIND_BIN_EXPR = 9
+
 
 class Node(Pattern):
     __slots__ = ("toks",)
 
     annotations = ("toks",)
 
+    kind: ClassVar[int]
+
     toks: Tuple[Text, ...]  # type: ignore
 
     def __init__(self, *args: Any, **kwargs: Any):
@@ -57,6 +89,8 @@ class Node(Pattern):
 class File(Node):
     __slots__ = ("stmts",)
 
+    kind = KIND_FILE
+
     stmts: Tuple[Union[Stmt, Expr], ...]  # type: ignore
 
 
@@ -67,12 +101,16 @@ class Stmt(Node):
 class Label(Stmt):
     __slots__ = ("name",)
 
+    kind = KIND_LABEL
+
     name: str  # type: ignore
 
 
 class Const(Stmt):
     __slots__ = ("name", "val")
 
+    kind = KIND_CONST
+
     name: str  # type: ignore
     val: Expr  # type: ignore
 
@@ -80,6 +118,8 @@ class Const(Stmt):
 class Offset(Stmt):
     __slots__ = ("offset", "relative")
 
+    kind = KIND_OFFSET
+
     offset: int  # type: ignore
     relative: Optional[str]  # type: ignore
 
@@ -87,6 +127,8 @@ class Offset(Stmt):
 class Op(Stmt):
     __slots__ = ("mnemonic", "args")
 
+    kind = KIND_OP
+
     mnemonic: str  # type: ignore
     args: Tuple[Expr, ...]  # type: ignore
 
@@ -113,73 +155,86 @@ BIN_OPS = {
 class Expr(Node):
     __slots__ = tuple()
 
-    def eval(self, scope: Dict[str, int]) -> int:
-        if isinstance(self, Val):
-            return self.val
-        elif isinstance(self, Name):
-            try:
-                return scope[self.name]
-            except KeyError:
-                raise Message(
-                    f"name '{self.name}' is not bound to any value", self.toks
-                )
-        elif isinstance(self, UnExpr):
-            try:
-                fn = UN_OPS[self.op]
-            except KeyError:  # pragma: no cover
-                # parser should prevent this from happening
-                raise Exception("invariant")
-
-            x = self.x.eval(scope)
-
-            return fn(x)
-        elif isinstance(self, BinExpr):
-            try:
-                fn = BIN_OPS[self.op]
-            except KeyError:  # pragma: no cover
-                # parser should prevent this from happening
-                raise Exception("invariant")
-
-            x = self.x.eval(scope)
-            y = self.y.eval(scope)
-
-            return fn(x, y)
-        else:  # pragma: no cover
-            raise Exception("invariant")
+    def eval(self, scope: Dict[str, int]) -> int:  # pragma: no cover
+        # each evaluable expression type overrides this, so the type of the
+        # node selects the right routine without any `isinstance` checks
+        raise Exception("invariant")
 
 
 class Deref(Expr):
     __slots__ = ("expr",)
 
+    kind = KIND_DEREF
+
     expr: Expr  # type: ignore
 
 
 class Name(Expr):
     __slots__ = ("name",)
 
+    kind = KIND_NAME
+
     name: str  # type: ignore
 
+    def eval(self, scope: Dict[str, int]) -> int:
+        val = scope.get(self.name)
+        if val is None:
+            raise Message(f"name '{self.name}' is not bound to any value", self.toks)
+        return val
+
 
 class Val(Expr):
     __slots__ = ("val",)
 
+    kind = KIND_VAL
+
     val: int  # type: ignore
 
+    def eval(self, scope: Dict[str, int]) -> int:
+        return self.val
+
 
 class UnExpr(Expr):
     __slots__ = ("op", "x")
 
+    kind = KIND_UN_EXPR
+
     op: str  # type: ignore
     x: Expr  # type: ignore
 
+    def eval(self, scope: Dict[str, int]) -> int:
+        try:
+            fn = UN_OPS[self.op]
+        except KeyError:  # pragma: no cover
+            # parser should prevent this from happening
+            raise Exception("invariant")
+
+        x = self.x.eval(scope)
+
+        return fn(x)
+
 
 class BinExpr(Expr):
     __slots__ = ("x", "op", "y")
 
+    kind = KIND_BIN_EXPR
+
     x: Expr  # type: ignore
     op: str  # type: ignore
     y: Expr  # type: ignore
 
+    def eval(self, scope: Dict[str, int]) -> int:
+        try:
+            fn = BIN_OPS[self.op]
+        except KeyError:  # pragma: no cover
+            # parser should prevent this from happening
+            raise Exception("invariant")
+
+        x = self.x.eval(scope)
+        y = self.y.eval(scope)
+
+        return fn(x, y)
+
 
 def optional(method: Callable[[Parser], T]) -> Callable[[Parser], Optional[T]]:
     @functools.wraps(method)
@@ -258,6 +313,10 @@ Kwargs = Tuple[Tuple[str, Any], ...]
 CacheKey = Tuple[Pos, ParserMethod, Args, Kwargs]
 CacheValue = Tuple[Optional[Node], Pos]
 
+# Takes the parser as its only argument.  Left unspecified since undecorated
+# methods are typed with `Self` rather than `Parser` in the class body.
+DirectiveParser = Callable[..., Optional[Stmt]]
+
 
 class Parser:
     __slots__ = ("toks", "cache", "last_reset")
@@ -278,7 +337,7 @@ class Parser:
 
     @classmethod
     def from_buf(cls, buf: TextIO) -> Parser:
-        lexer = Lexer(buf)
+        lexer = Lexer.from_buf(buf)
         return cls(lexer)
 
     @contextlib.contextmanager
@@ -312,16 +371,28 @@ class Parser:
         return tok
 
     def maybe(self, *alts: str) -> Optional[Text]:
-        res = None
-        with self.reset():
-            res = self.expect(*alts)
+        # Check the next token directly instead of going through `expect` since
+        # a missing optional token is common and raising a reset for it would
+        # be wasted work.  Parse errors are reported from the resets raised by
+        # statement rules, so none is needed here.
+        tok = self.toks.peek()
 
-        return res
+        if not isinstance(tok, Text):
+            return None
+        if len(alts) > 0 and tok.text not in alts:
+            return None
+
+        self.toks.get()
+
+        return tok
 
     def parse_file(self) -> File:
-        stmts = []
-        while stmt := self.parse_stmt():
-            stmts.append(stmt)
+        stmts: List[Union[Stmt, Expr]] = []
+
+        parse_stmt = self.parse_stmt
+        add_stmt = stmts.append
+        while stmt := parse_stmt():
+            add_stmt(stmt)
 
         tok = self.toks.get()
         if not isinstance(tok, Eof):
@@ -333,20 +404,43 @@ class Parser:
         return File(tuple(stmts))
 
     def parse_stmt(self) -> Optional[Union[Stmt, Expr]]:
-        if const := self.parse_const():
-            return const
-        if offset := self.parse_offset():
-            return offset
-        elif label := self.parse_label():
-            return label
+        for parse_directive in self.directive_parsers():
+            if stmt := parse_directive(self):
+                return stmt
         return self.parse_inst()
 
+    def directive_parsers(self) -> Tuple[DirectiveParser, ...]:
+        """
+        Return the parsers for any constant, offset, or label the next tokens
+        could begin.  Each of those has a '+' or '-' as its first token or an
+        '=' or ':' as its second, so two tokens of lookahead rule most
+        statements out without trying to parse them.
+        """
+        pos = self.toks.mark()
+
+        fst = self.toks.get()
+        if not isinstance(fst, Text):
+            res = ()
+        elif fst.text in ("+", "-"):
+            res = self.all_directives
+        else:
+            # a text token is always followed by at least an eof token
+            snd = self.toks.get()
+            if isinstance(snd, Text):
+                res = self.directives.get(snd.text, ())
+            else:
+                res = ()
+
+        self.toks.reset(pos)
+
+        return res
+
     @optional
     def parse_const(self) -> Const:
         name = self.expect()
         eq = self.expect("=")
 
-        if not NAME_RE.match(name.text):
+        if not match_name(name.text):
             raise Stop(f"{repr(name.text)} is not a valid name", (name,))
 
         val = self.parse_expr()
@@ -355,7 +449,7 @@ class Parser:
 
         self.expect_newline()
 
-        return Const(name.text, val, toks=(name, eq) + val.toks)
+        return Const(sys.intern(name.text), val, toks=(name, eq) + val.toks)
 
     def parse_offset(self) -> Optional[Offset]:
         if off := self.parse_relative():
@@ -369,7 +463,7 @@ class Parser:
         val = self.expect()
         colon = self.expect(":")
 
-        if not VAL_RE.match(val.text):
+        if not match_val(val.text):
             raise Stop(f"{repr(val.text)} is not a valid offset", (val,))
 
         # optional trailing newline
@@ -383,7 +477,7 @@ class Parser:
         val = self.expect()
         colon = self.expect(":")
 
-        if not VAL_RE.match(val.text):
+        if not match_val(val.text):
             raise Reset(f"{repr(val.text)} is not a valid offset", (val,))
 
         # optional trailing newline
@@ -397,14 +491,26 @@ class Parser:
         name = self.expect()
         colon = self.expect(":")
 
-        if not NAME_RE.match(name.text):
+        if not match_name(name.text):
             raise Stop(f"{repr(name.text)} is not a valid name or offset", (name,))
 
         # optional trailing newline
         with self.reset():
             self.expect_newline()
 
-        return Label(name.text, toks=(name, colon))
+        return Label(sys.intern(name.text), toks=(name, colon))
+
+    # directive parsers in the order they're tried, keyed by the second token
+    # of the statements they could parse
+    all_directives: ClassVar[Tuple[DirectiveParser, ...]] = (
+        parse_const,
+        parse_offset,
+        parse_label,
+    )
+    directives: ClassVar[Dict[str, Tuple[DirectiveParser, ...]]] = {
+        "=": (parse_const,),
+        ":": (parse_offset, parse_label),
+    }
 
     def parse_inst(self) -> Union[Op, Expr, None]:
         if nullary := self.parse_nullary():
@@ -423,7 +529,7 @@ class Parser:
     @optional
     def parse_unary(self) -> Op:
         mnemonic = self.expect()
-        if not NAME_RE.match(mnemonic.text):
+        if not match_name(mnemonic.text):
             raise Reset(
                 f"'{mnemonic.text}' is not a valid name or expression", (mnemonic,)
             )
@@ -436,12 +542,15 @@ class Parser:
 
         self.expect_newline()
 
-        return Op(mnemonic.text, (arg,), toks=(mnemonic,) + arg.toks)
+        # Mnemonics and other names are drawn from a small set and used as
+        # instruction table and scope keys, so they're interned wherever
+        # they're parsed to make those lookups cheaper
+        return Op(sys.intern(mnemonic.text), (arg,), toks=(mnemonic,) + arg.toks)
 
     @optional
     def parse_binary(self) -> Op:
         mnemonic = self.expect()
-        if not NAME_RE.match(mnemonic.text):
+        if not match_name(mnemonic.text):
             raise Reset(
                 f"'{mnemonic.text}' is not a valid name or expression", (mnemonic,)
             )
@@ -461,7 +570,7 @@ class Parser:
         self.expect_newline(error=Stop)
 
         toks = (mnemonic,) + arg1.toks + (comma,) + arg2.toks
-        return Op(mnemonic.text, (arg1, arg2), toks=toks)
+        return Op(sys.intern(mnemonic.text), (arg1, arg2), toks=toks)
 
     @optional
     def parse_atom(self) -> Expr:
@@ -487,16 +596,22 @@ class Parser:
 
         else:
             name_or_val = self.expect()
+            text = name_or_val.text
+
+            # values always start with a digit and names never do, so only one
+            # pattern needs to be tried
+            if "0" <= text[0] <= "9":
+                # plain decimal literals are valid without consulting the
+                # pattern
+                if (text.isascii() and text.isdigit()) or match_val(text):
+                    return Val(str_to_int(text), toks=(name_or_val,))
+            elif match_name(text):
+                return Name(sys.intern(text), toks=(name_or_val,))
 
-            if VAL_RE.match(name_or_val.text):
-                return Val(str_to_int(name_or_val.text), toks=(name_or_val,))
-            elif NAME_RE.match(name_or_val.text):
-                return Name(name_or_val.text, toks=(name_or_val,))
-            else:
-                raise Reset(
-                    f"{repr(name_or_val.text)} is not a valid name or integer",
-                    (name_or_val,),
-                )
+            raise Reset(
+                f"{repr(text)} is not a valid name or integer",
+                (name_or_val,),
+            )
 
     def parse_power(self: Parser) -> Optional[Expr]:
         x = self.parse_atom()
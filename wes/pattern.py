@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections import deque
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple
 
 from wes.exceptions import PatternError
 from wes.utils import SlotClass
@@ -12,23 +12,27 @@ class Pattern(SlotClass):
 
     annotations: Tuple[str, ...] = tuple()
 
+    # names of slots holding parameters, computed once per subclass
+    _param_names: ClassVar[Tuple[str, ...]] = tuple()
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+
+        cls._param_names = tuple(n for n in cls.__slots__ if n not in cls.annotations)
+
     @property
     def params(self) -> Tuple[Any, ...]:
         """
         Return a tuple of parameters provided to a pattern.
         """
-        return tuple(
-            getattr(self, n) for n in self.__slots__ if n not in self.annotations
-        )
+        return tuple(getattr(self, n) for n in self._param_names)
 
     def equal(self, p: Pattern) -> bool:
         """
         Return ``True`` if ``p`` should be considered an instance of *and* an
         equal parameterization of this pattern type.
         """
-        return (type(self) is type(p)) and all(
-            x == y for x, y in zip(self.params, p.params)
-        )
+        return (type(self) is type(p)) and self.params == p.params
 
     def unify(self, p: Pattern) -> Substitutions:
         """
@@ -8,10 +8,11 @@ BASES = {
 
 
 def str_to_int(s: str) -> int:
-    prefix = s[:2]
-    base = BASES.get(prefix, 10)
+    # plain decimal literals are the most common and need no prefix lookup
+    if s.isdigit():
+        return int(s)
 
-    return int(s, base=base)
+    return int(s, BASES.get(s[:2], 10))
 
 
 def byte_length(i: int) -> int:
@@ -35,14 +36,19 @@ class SlotClass:
     __slots__: Tuple[str, ...] = ()
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
+        slots = self.__slots__
+
         # set parameters
-        for name, param in zip(self.__slots__, args):
+        for name, param in zip(slots, args):
             setattr(self, name, param)
         for name, param in kwargs.items():
             setattr(self, name, param)
 
-        # make sure all parameters are set
-        for name in self.__slots__:
+        # make sure all parameters are set.  Those given positionally or by
+        # keyword are known to be, so only the rest need to be checked.
+        for name in slots[len(args) :]:
+            if name in kwargs:
+                continue
             try:
                 getattr(self, name)
             except AttributeError: